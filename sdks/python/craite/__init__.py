@@ -1,7 +1,29 @@
 """CRAITE Python SDK"""
 __version__ = "1.0.0"
 
-from .client import create_client, CRAITEClient
-from .mcp_tools import MCPTool
+import importlib
 
-__all__ = ["create_client", "CRAITEClient", "MCPTool"]
+# Public names are resolved on first access (PEP 562) so that `import craite`
+# does not load the client or tool modules until they are needed
+_LAZY_ATTRS = {
+    "create_client": (".client", "create_client"),
+    "create_async_client": (".client", "create_async_client"),
+    "CRAITEClient": (".client", "CRAITEClient"),
+    "AsyncCRAITEClient": (".client", "AsyncCRAITEClient"),
+    "MCPTool": (".mcp_tools", "BaseMCPTool"),
+}
+
+__all__ = ["create_client", "create_async_client", "CRAITEClient", "AsyncCRAITEClient", "MCPTool"]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module_name, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
@@ -7,18 +7,49 @@ import os
 import sys
 import json
 from pathlib import Path
-from typing import Optional
-from rich.console import Console
-from rich.syntax import Syntax
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-import asyncio
+from typing import Optional, Tuple
 
-from . import create_client, create_async_client
-from .utils import save_code_to_file, format_solidity_code, format_python_code
-from .mcp_tools import MCPToolRegistry
+from .utils import extract_code_blocks, save_code_to_file, format_solidity_code, format_python_code, json_loads
 
-console = Console()
+# Streamed deltas are buffered and written to disk (off the event loop) in
+# batches of this many
+_STREAM_FLUSH_DELTAS = 64
+
+# rich, asyncio and the client stack are imported inside the commands that use
+# them so that `craite --help` and light commands start quickly
+_console = None
+
+
+def get_console():
+    """Return the shared rich console, creating it on first use"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed"""
+    import asyncio
+    
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    
+    if sys.version_info >= (3, 11):
+        # A loop factory keeps uvloop local to this run instead of changing the
+        # process-wide policy (the policy API is deprecated from 3.14)
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    
+    policy = asyncio.get_event_loop_policy()
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    try:
+        return asyncio.run(coro)
+    finally:
+        asyncio.set_event_loop_policy(policy)
 
 
 @click.group()
@@ -38,41 +69,42 @@ def cli():
 @click.option("--provider", default="openai", help="LLM provider")
 def generate(prompt: str, language: str, mode: str, output: Optional[str], tools: tuple, api_key: str, provider: str):
     """Generate code from a prompt"""
+    from rich.syntax import Syntax
+    from .client import create_client, create_async_client
+    
+    console = get_console()
     
     if not api_key:
         console.print("[red]Error: API key is required. Set OPENAI_API_KEY or use --api-key[/red]")
         sys.exit(1)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Generating code...", total=None)
-        
+    with console.status("Generating code...", spinner="dots"):
         try:
-            client = create_client(api_key, provider=provider)
-            
             if tools:
-                result = client.generate_with_tools(
-                    prompt=prompt,
-                    tools=list(tools),
-                    language=language,
-                    mode=mode
-                )
-                progress.update(task, description="Code generated with MCP tools!")
+                async def generate_with_tools():
+                    async with create_async_client(api_key, provider=provider) as client:
+                        return await client.generate_with_tools_async(
+                            prompt=prompt,
+                            tools=list(tools),
+                            language=language,
+                            mode=mode
+                        )
+                
+                result = run_async(generate_with_tools())
             else:
+                client = create_client(api_key, provider=provider)
                 result = client.generate(
                     prompt=prompt,
                     language=language,
                     mode=mode
                 )
-                progress.update(task, description="Code generated!")
         
         except Exception as e:
             console.print(f"[red]Error: {e}[/red]")
             sys.exit(1)
     
+    console.print("[green]✓ Code generated with MCP tools![/green]" if tools else "[green]✓ Code generated![/green]")
+    
     # Display result
     console.print("\n[bold green]Generated Code:[/bold green]")
     
@@ -106,7 +138,9 @@ def generate(prompt: str, language: str, mode: str, output: Optional[str], tools
 @click.option("-n", "--name", default="MyContract", help="Contract name")
 @click.option("-f", "--features", multiple=True, help="Contract features")
 @click.option("-o", "--output", help="Output file path")
-def scaffold(contract_type: str, name: str, features: tuple, output: Optional[str]):
+@click.option("--api-key", envvar="OPENAI_API_KEY", help="API key for LLM provider")
+@click.option("--provider", default="openai", help="LLM provider")
+def scaffold(contract_type: str, name: str, features: tuple, output: Optional[str], api_key: str, provider: str):
     """Generate a smart contract scaffold using OpenZeppelin"""
     
     prompt = f"Create a {contract_type} contract named {name}"
@@ -121,7 +155,9 @@ def scaffold(contract_type: str, name: str, features: tuple, output: Optional[st
         language="solidity",
         mode="production",
         output=output,
-        tools=("openzeppelin_contracts",)
+        tools=("openzeppelin_contracts",),
+        api_key=api_key,
+        provider=provider
     )
 
 
@@ -131,32 +167,33 @@ def scaffold(contract_type: str, name: str, features: tuple, output: Optional[st
 @click.option("--gas/--no-gas", default=True, help="Run gas optimization")
 def analyze(file: str, security: bool, gas: bool):
     """Analyze a smart contract for security and gas optimization"""
+    from rich.table import Table
+    from .mcp_tools import get_registry
+    
+    console = get_console()
     
     with open(file, "r") as f:
         code = f.read()
     
-    registry = MCPToolRegistry()
-    results = {}
+    registry = get_registry()
     
     console.print(f"\n[bold]Analyzing: {file}[/bold]\n")
     
+    requests = []
     if security:
-        with console.status("Running security audit..."):
-            security_tool = registry.get_tool("security_audit")
-            if security_tool:
-                result = security_tool.execute({"code": code, "language": "solidity"})
-                results["security"] = result
-    
+        requests.append(("security_audit", {"code": code, "language": "solidity"}))
     if gas:
-        with console.status("Running gas optimization analysis..."):
-            gas_tool = registry.get_tool("gas_optimization")
-            if gas_tool:
-                result = gas_tool.execute({"code": code})
-                results["gas"] = result
+        requests.append(("gas_optimization", {"code": code}))
+    
+    with console.status("Running analysis..."):
+        results = dict(zip(
+            (name for name, _ in requests),
+            registry.execute_batch(requests)
+        ))
     
     # Display results
-    if "security" in results and results["security"].success:
-        data = results["security"].data
+    if "security_audit" in results and results["security_audit"].success:
+        data = results["security_audit"].data
         console.print("[bold red]Security Analysis:[/bold red]")
         console.print(f"Score: {data['score']}/100")
         
@@ -177,11 +214,10 @@ def analyze(file: str, security: bool, gas: bool):
         else:
             console.print("[green]✓ No security issues found![/green]")
     
-    if "gas" in results and results["gas"].success:
-        data = results["gas"].data
+    if "gas_optimization" in results and results["gas_optimization"].success:
+        data = results["gas_optimization"].data
         console.print("\n[bold yellow]Gas Optimization:[/bold yellow]")
-        console.print(f"Optimization Score: {data['optimization_score']}/100")
-        console.print(f"Estimated Savings: {data['estimated_total_savings']}")
+        console.print(f"Estimated Savings: {data['estimated_savings']}")
         
         if data["suggestions"]:
             table = Table(title="Optimization Suggestions")
@@ -206,7 +242,12 @@ def analyze(file: str, security: bool, gas: bool):
 @cli.command()
 def tools():
     """List available MCP tools"""
-    registry = MCPToolRegistry()
+    from rich.table import Table
+    from .mcp_tools import get_registry
+    
+    console = get_console()
+    
+    registry = get_registry()
     tools_list = registry.list_tools()
     
     table = Table(title="Available MCP Tools")
@@ -224,40 +265,159 @@ def tools():
 @cli.command()
 @click.argument("prompts-file", type=click.Path(exists=True))
 @click.option("-o", "--output-dir", default="generated", help="Output directory")
+@click.option("-c", "--max-concurrent", default=5, type=click.IntRange(min=1), help="Maximum concurrent requests")
+@click.option("--stream/--no-stream", default=False, help="Write responses to disk as they are generated")
 @click.option("--api-key", envvar="OPENAI_API_KEY", help="API key for LLM provider")
-def batch(prompts_file: str, output_dir: str, api_key: str):
-    """Generate multiple code files from a JSON file of prompts"""
+def batch(prompts_file: str, output_dir: str, max_concurrent: int, stream: bool, api_key: str):
+    """Generate multiple code files from a prompts file
+    
+    The file is either NDJSON (one prompt object per line), which is streamed so
+    generation starts as soon as the first line is read, or a JSON array.
+    """
+    import asyncio
+    from .client import create_async_client
+    
+    console = get_console()
     
     if not api_key:
         console.print("[red]Error: API key is required. Set OPENAI_API_KEY or use --api-key[/red]")
         sys.exit(1)
     
-    with open(prompts_file, "r") as f:
-        prompts = json.load(f)
-    
-    if not isinstance(prompts, list):
-        console.print("[red]Error: Prompts file must contain a JSON array[/red]")
-        sys.exit(1)
+    def iter_prompts():
+        with open(prompts_file, "rb") as f:
+            lineno = 1
+            first = f.read(1)
+            while first.isspace():
+                if first == b"\n":
+                    lineno += 1
+                first = f.read(1)
+            
+            if first == b"[":
+                # Legacy format: a single JSON array
+                yield from json_loads(first + f.read())
+                return
+            
+            line = first + f.readline()
+            while line:
+                if line.strip():
+                    try:
+                        prompt_data = json_loads(line)
+                    except ValueError as e:
+                        # The decoder only sees one line, so its position is always line 1
+                        raise click.UsageError(f"line {lineno}: {e}") from e
+                    yield prompt_data
+                line = f.readline()
+                lineno += 1
     
-    async def process_batch():
-        client = create_async_client(api_key)
-        results = await client.generate_batch_async(prompts)
+    async def process_batch() -> Tuple[int, int]:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * max_concurrent)
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        generated = 0
+        failed = 0
         
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        async def stream_to_file(client, prompt_data, filepath):
+            chunks = []
+            written = 0  # number of chunks already handed to the file
+            f = await loop.run_in_executor(None, open, filepath, "w")
+            
+            async def flush():
+                nonlocal written
+                text = "".join(chunks[written:])
+                written = len(chunks)
+                if text:
+                    await loop.run_in_executor(None, f.write, text)
+            
+            try:
+                async for delta in client.generate_stream_async(**prompt_data):
+                    chunks.append(delta)
+                    # Deltas are a few characters each, so write them in batches
+                    if len(chunks) - written >= _STREAM_FLUSH_DELTAS:
+                        await flush()
+            except Exception as e:
+                # Mark the partial file, then let the worker count the failure
+                chunks.append(f"\n// Error generating code: {e}")
+                raise
+            finally:
+                try:
+                    await flush()
+                finally:
+                    await loop.run_in_executor(None, f.close)
+            
+            # Keep only the code once the full response is known
+            blocks = extract_code_blocks("".join(chunks))
+            if blocks:
+                await loop.run_in_executor(None, filepath.write_text, blocks[0]["code"])
         
-        for i, (prompt_data, result) in enumerate(zip(prompts, results)):
-            filename = prompt_data.get("filename", f"generated_{i}.{result['language']}")
-            filepath = Path(output_dir) / filename
+        async def generate_one(client, i, prompt_data):
+            filename = prompt_data.pop("filename", None)
             
-            with open(filepath, "w") as f:
-                f.write(result["code"])
+            if stream:
+                language = prompt_data.get("language", "solidity")
+                filepath = output_path / (filename or f"generated_{i}.{language}")
+                await stream_to_file(client, prompt_data, filepath)
+            else:
+                result = await client.generate_async(**prompt_data)
+                
+                # Write off the event loop so other responses keep streaming in
+                filepath = output_path / (filename or f"generated_{i}.{result['language']}")
+                await loop.run_in_executor(None, filepath.write_text, result["code"])
+                
+                # generate_async reports API failures in the result instead of raising
+                if "error" in result:
+                    raise RuntimeError(result["error"])
             
-            console.print(f"[green]✓ Generated: {filepath}[/green]")
+            return filepath
+        
+        async def worker(client):
+            nonlocal generated, failed
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    i, prompt_data = item
+                    
+                    # A failing prompt is reported and skipped; letting it end the
+                    # worker would leave the producer blocked on a full queue
+                    try:
+                        filepath = await generate_one(client, i, prompt_data)
+                    except Exception as e:
+                        failed += 1
+                        console.print(f"[red]✗ Prompt {i} failed: {e}[/red]")
+                    else:
+                        generated += 1
+                        console.print(f"[green]✓ Generated: {filepath}[/green]")
+                finally:
+                    queue.task_done()
+        
+        async with create_async_client(api_key, max_concurrent=max_concurrent) as client:
+            workers = [asyncio.create_task(worker(client)) for _ in range(max_concurrent)]
+            try:
+                for i, prompt_data in enumerate(iter_prompts()):
+                    if not isinstance(prompt_data, dict):
+                        raise click.UsageError(f"Prompt {i} must be a JSON object")
+                    await queue.put((i, prompt_data))
+            finally:
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+        
+        return generated, failed
     
-    with console.status(f"Processing {len(prompts)} prompts..."):
-        asyncio.run(process_batch())
+    with console.status("Processing prompts..."):
+        try:
+            generated, failed = run_async(process_batch())
+        except (json.JSONDecodeError, click.UsageError) as e:
+            console.print(f"[red]Error: Invalid prompts file: {e}[/red]")
+            sys.exit(1)
     
-    console.print(f"\n[bold green]✓ Batch generation complete! Files saved to: {output_dir}[/bold green]")
+    console.print(f"\n[bold green]✓ Batch generation complete! {generated} files saved to: {output_dir}[/bold green]")
+    
+    if failed:
+        console.print(f"[red]✗ {failed} prompts failed[/red]")
+        sys.exit(1)
 
 
 def main():
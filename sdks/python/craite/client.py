@@ -1,74 +1,658 @@
 """CRAITE Client - AI-powered Web3 code generation"""
 import os
-from typing import Dict, Any, Optional
+import copy
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 
-try:
-    from openai import OpenAI
-except ImportError:
-    raise ImportError("Please install openai: pip install openai>=1.0.0")
+from .mcp_tools import MCPToolResult, get_registry
+from .utils import _iter_code_blocks
+
+
+_BASE_SYSTEM_PROMPT = """You are CRAITE, an expert Web3 and blockchain code generator.
+        Generate production-ready, secure, and optimized code.
+        Include helpful comments but keep the code clean.
+        For smart contracts, follow best security practices."""
+
+# Fully assembled system prompt per generation mode
+_SYSTEM_PROMPTS: Dict[str, str] = {
+    "production": _BASE_SYSTEM_PROMPT,
+    "educational": _BASE_SYSTEM_PROMPT + """
+        Explain the key concepts and design decisions alongside the code."""
+}
+
+def _load_openai():
+    """Import the openai SDK on first client construction
+    
+    openai pulls in httpx and pydantic, so deferring it keeps ``import craite``
+    (and CLI commands that never call a model) fast.
+    """
+    try:
+        import openai
+    except ImportError:
+        raise ImportError("Please install openai: pip install openai>=1.0.0")
+    return openai
+
+
+def _build_async_http_client(openai, max_concurrent: int, timeout: float):
+    """HTTP/2 transport for the async client, or None to use the SDK default
+    
+    With HTTP/2 concurrent requests are multiplexed over one TLS connection
+    instead of opening a socket per in-flight request. Requires ``h2``
+    (``pip install craite-sdk[fast]``).
+    """
+    try:
+        import httpx
+        import h2  # noqa: F401
+    except ImportError:
+        return None
+    
+    return openai.DefaultAsyncHttpxClient(
+        http2=True,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_concurrent,
+            max_keepalive_connections=max_concurrent
+        )
+    )
+
+
+# Anthropic is reached through its OpenAI-compatible endpoint, so both
+# providers share the same SDK client and request path
+_PROVIDER_BASE_URLS: Dict[str, Optional[str]] = {
+    "openai": None,
+    "anthropic": "https://api.anthropic.com/v1/"
+}
+
+_DEFAULT_MODELS: Dict[str, str] = {
+    "openai": "gpt-4",
+    "anthropic": "claude-3-5-sonnet-latest"
+}
+
+
+def _get_headers(provider: str, api_key: str) -> Dict[str, str]:
+    """Provider-specific auth headers sent in addition to the SDK defaults"""
+    if provider == "openai":
+        # The OpenAI SDK already sends "Authorization: Bearer <api_key>"
+        return {}
+    elif provider == "anthropic":
+        return {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+    raise ValueError(f"Provider {provider} not supported yet")
+
+
+# Chat messages are built once; the dicts are shared read-only by every request
+_SYSTEM_MESSAGES: Dict[str, Dict[str, str]] = {
+    mode: {"role": "system", "content": prompt}
+    for mode, prompt in _SYSTEM_PROMPTS.items()
+}
+
+
+def _split_response(content: str) -> Tuple[str, str]:
+    """Split a model response into (code, explanation) in a single pass
+    
+    The code is the body of the first fenced block; the explanation is the
+    prose left over once every fenced block is cut out.
+    """
+    if "```" not in content:
+        return content, ""
+    
+    code = None
+    pieces = []
+    last = 0
+    for start, end, _, block in _iter_code_blocks(content):
+        if code is None:
+            code = block
+        pieces.append(content[last:start])
+        last = end
+    
+    if code is None:
+        return content, ""
+    
+    pieces.append(content[last:])
+    return code, "".join(pieces).strip()
+
+
+# Appended to educational-mode explanations; joined once at import time
+_ENHANCEMENTS_SUFFIX = "\n".join([
+    "",
+    "",
+    "### Key Concepts:",
+    "- Review access control on every state-changing function",
+    "- Follow the checks-effects-interactions pattern for external calls",
+    "- Emit events for state changes so off-chain tools can index them",
+    "",
+    "### Additional Resources:",
+    "- Solidity docs: https://docs.soliditylang.org/",
+    "- OpenZeppelin contracts: https://docs.openzeppelin.com/contracts/",
+    "- Ethereum developer docs: https://ethereum.org/en/developers/docs/"
+])
+
+
+def _enhance_explanation(explanation: str) -> str:
+    """Append learning resources to an explanation (idempotent)"""
+    if not explanation or explanation.endswith(_ENHANCEMENTS_SUFFIX):
+        return explanation
+    return explanation + _ENHANCEMENTS_SUFFIX
+
+
+def _tool_params(prompt: str, language: str) -> Dict[str, Any]:
+    """Build MCP tool parameters from a generation prompt"""
+    normalized = prompt.upper().replace("-", "")
+    contract_type = next(
+        (ct for ct in ("ERC1155", "ERC721", "ERC20") if ct in normalized),
+        "ERC20"
+    )
+    
+    return {
+        "prompt": prompt,
+        "language": language,
+        "contract_type": contract_type,
+        # Tools keep only the words they recognise as features
+        "features": prompt.replace(",", " ").split()
+    }
+
+
+_TOOL_CONTEXT_HEADER = "\n\n### Additional Context from MCP Tools:\n\n"
+_TOOL_HEADING_TEMPLATE = "**{tool}**:\n"
+_TOOL_ITEM_TEMPLATE = "- {}: {}\n"
+
+
+def _enhance_prompt_with_tools(prompt: str, tool_results: List[Dict[str, Any]]) -> str:
+    """Append MCP tool output to the prompt as extra context"""
+    if not tool_results:
+        return prompt
+    
+    # Collect the pieces and join once rather than rebuilding the string
+    parts = [prompt, _TOOL_CONTEXT_HEADER]
+    
+    for r in tool_results:
+        parts.append(_TOOL_HEADING_TEMPLATE.format_map(r))
+        if isinstance(r["result"], dict):
+            parts.extend(_TOOL_ITEM_TEMPLATE.format(key, value) for key, value in r["result"].items())
+        else:
+            parts.append(f"{r['result']}\n")
+        parts.append("\n")
+    
+    return "".join(parts)
+
+
+class _AsyncRateLimiter:
+    """Token bucket allowing ``rate`` request starts per ``period`` seconds
+    
+    Spreads requests out to stay under a provider's per-minute quota instead
+    of bursting into 429 responses and retry backoff.
+    """
+    
+    __slots__ = ("rate", "period", "_tokens", "_updated")
+    
+    def __init__(self, rate: int, period: float = 60.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        import asyncio
+        
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+            self._updated = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+
+class _ResultCache:
+    """Small LRU cache of generation results keyed by request parameters"""
+    
+    __slots__ = ("maxsize", "_entries")
+    
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+    
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        result = self._entries.get(key)
+        if result is None:
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+    
+    def put(self, key: Tuple, result: Dict[str, Any]) -> None:
+        self._entries[key] = copy.deepcopy(result)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _build_sync_client(api_key: str, provider: str, max_retries: int, timeout: float):
+    """OpenAI SDK client configured for ``provider``"""
+    return _load_openai().OpenAI(
+        api_key=api_key,
+        base_url=_PROVIDER_BASE_URLS.get(provider),
+        default_headers=_get_headers(provider, api_key),
+        max_retries=max_retries,
+        timeout=timeout
+    )
+
+
+class _SharedTransports:
+    """Reference-counted OpenAI clients shared between ``create_client`` results"""
+    
+    __slots__ = ("_entries",)
+    
+    def __init__(self):
+        # key -> [OpenAI client, number of CRAITEClients using it]
+        self._entries: Dict[Tuple, List[Any]] = {}
+    
+    def acquire(self, key: Tuple, factory) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [factory(), 0]
+        entry[1] += 1
+        return entry[0]
+    
+    def release(self, transport: Any) -> bool:
+        """Drop one user of ``transport``; True when it should now be closed"""
+        for key, entry in self._entries.items():
+            if entry[0] is transport:
+                entry[1] -= 1
+                if entry[1]:
+                    return False
+                del self._entries[key]
+                break
+        return True
 
 
 class CRAITEClient:
-    """Client for interacting with CRAITE code generation"""
+    """Client for interacting with CRAITE code generation
     
-    def __init__(self, api_key: str, provider: str = "openai", model: str = None):
+    The underlying ``OpenAI`` client keeps a pooled keep-alive connection and
+    retries 429/5xx responses with backoff, so reuse one client for repeated
+    generations and ``close()`` it (or use it as a context manager) when done.
+    """
+    
+    __slots__ = (
+        "api_key", "provider", "model", "max_retries", "timeout",
+        "client", "mcp_registry", "_complete", "_result_cache", "_closed"
+    )
+    
+    def __init__(
+        self,
+        api_key: str,
+        provider: str = "openai",
+        model: str = None,
+        max_retries: int = 3,
+        timeout: float = 60.0,
+        cache_size: int = 512,
+        client: Any = None
+    ):
         self.api_key = api_key
         self.provider = provider
-        self.model = model or "gpt-4"
+        self.model = model or _DEFAULT_MODELS.get(provider)
+        self._result_cache = _ResultCache(cache_size)
+        self.mcp_registry = get_registry()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._closed = False
         
-        if provider == "openai":
-            self.client = OpenAI(api_key=api_key)
-        else:
-            raise ValueError(f"Provider {provider} not supported yet")
+        # An existing OpenAI client may be passed in to share its connection pool
+        if client is None:
+            client = _build_sync_client(api_key, provider, max_retries, timeout)
+        self.client = client
+        
+        # Resolve the completion call once instead of walking the SDK's
+        # resource attributes on every request
+        self._complete = self.client.chat.completions.create
+    
+    def __enter__(self) -> "CRAITEClient":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool
+        
+        A pool shared through ``create_client`` is closed once every client
+        using it has been closed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        
+        if _SHARED_TRANSPORTS.release(self.client):
+            self.client.close()
     
     def generate(self, prompt: str, language: str = "solidity", **options) -> Dict[str, Any]:
-        """Generate Web3 code from a natural language prompt"""
+        """Generate Web3 code from a natural language prompt
         
-        system_prompt = """You are CRAITE, an expert Web3 and blockchain code generator.
-        Generate production-ready, secure, and optimized code.
-        Include helpful comments but keep the code clean.
-        For smart contracts, follow best security practices."""
+        Results of deterministic requests (``temperature=0``), or of any request
+        made with ``cache=True``, are memoized per client so repeated prompts
+        skip the API round-trip.
+        """
+        
+        mode = options.get("mode")
+        if mode not in _SYSTEM_MESSAGES:
+            mode = "production"
         
         full_prompt = f"Generate {language} code for: {prompt}"
+        temperature = options.get("temperature", 0.7)
+        max_tokens = options.get("max_tokens", 2000)
+        
+        # Only deterministic requests are cached unless the caller opts in
+        cache_key = None
+        if options.get("cache", temperature == 0):
+            cache_key = (self.provider, self.model, mode, full_prompt, round(temperature, 3), max_tokens)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         try:
-            response = self.client.chat.completions.create(
+            response = self._complete(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    _SYSTEM_MESSAGES[mode],
                     {"role": "user", "content": full_prompt}
                 ],
-                temperature=options.get("temperature", 0.7),
-                max_tokens=options.get("max_tokens", 2000)
+                temperature=temperature,
+                max_tokens=max_tokens
             )
             
-            code = response.choices[0].message.content
+            code, explanation = _split_response(response.choices[0].message.content)
+            if mode == "educational":
+                explanation = _enhance_explanation(explanation)
+            
+            result = {
+                "code": code,
+                "language": language,
+                "model": self.model,
+                "explanation": explanation or "Generated successfully"
+            }
+            
+            if cache_key is not None:
+                self._result_cache.put(cache_key, result)
             
-            # Extract code from markdown if present
-            if "```" in code:
-                import re
-                code_match = re.search(r'```[\w]*\n([\s\S]*?)\n```', code)
-                if code_match:
-                    code = code_match.group(1)
+            return result
             
+        except Exception as e:
             return {
+                "code": f"// Error generating code: {str(e)}",
+                "language": language,
+                "explanation": f"Failed to generate: {str(e)}",
+                "error": str(e)
+            }
+
+    
+    def generate_with_tools(
+        self,
+        prompt: str,
+        tools: List[str],
+        language: str = "solidity",
+        **options
+    ) -> Dict[str, Any]:
+        """Generate code with MCP tool output added to the prompt"""
+        params = _tool_params(prompt, language)
+        tool_results = []
+        
+        for tool_name in tools:
+            tool_result = self.mcp_registry.execute_tool(tool_name, params)
+            if tool_result.success:
+                tool_results.append({"tool": tool_name, "result": tool_result.data})
+        
+        result = self.generate(_enhance_prompt_with_tools(prompt, tool_results), language, **options)
+        result["tools_used"] = [r["tool"] for r in tool_results]
+        return result
+
+
+class AsyncCRAITEClient:
+    """Async client for concurrent CRAITE code generation
+
+    A single ``AsyncOpenAI`` instance (and its pooled HTTP connections) is
+    shared by every request, so batches only pay connection setup once.
+    Use as an async context manager to release the pool when done.
+    """
+    
+    __slots__ = (
+        "api_key", "provider", "model", "max_concurrent", "max_retries", "timeout",
+        "client", "mcp_registry", "_complete", "_result_cache", "_limiter"
+    )
+    
+    def __init__(
+        self,
+        api_key: str,
+        provider: str = "openai",
+        model: str = None,
+        max_concurrent: int = 5,
+        max_retries: int = 3,
+        timeout: float = 60.0,
+        rate_limit_qpm: Optional[int] = 500,
+        cache_size: int = 512
+    ):
+        self.api_key = api_key
+        self.provider = provider
+        self.model = model or _DEFAULT_MODELS.get(provider)
+        self._result_cache = _ResultCache(cache_size)
+        self.mcp_registry = get_registry()
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._limiter = _AsyncRateLimiter(rate_limit_qpm) if rate_limit_qpm else None
+        
+        openai = _load_openai()
+        self.client = openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=_PROVIDER_BASE_URLS.get(provider),
+            default_headers=_get_headers(provider, api_key),
+            max_retries=max_retries,
+            timeout=timeout,
+            http_client=_build_async_http_client(openai, max_concurrent, timeout)
+        )
+        
+        self._complete = self.client.chat.completions.create
+    
+    async def __aenter__(self) -> "AsyncCRAITEClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        await self.client.close()
+    
+    async def generate_async(self, prompt: str, language: str = "solidity", **options) -> Dict[str, Any]:
+        """Generate Web3 code from a natural language prompt"""
+        
+        mode = options.get("mode")
+        if mode not in _SYSTEM_MESSAGES:
+            mode = "production"
+        
+        full_prompt = f"Generate {language} code for: {prompt}"
+        temperature = options.get("temperature", 0.7)
+        max_tokens = options.get("max_tokens", 2000)
+        
+        # Only deterministic requests are cached unless the caller opts in
+        cache_key = None
+        if options.get("cache", temperature == 0):
+            cache_key = (self.provider, self.model, mode, full_prompt, round(temperature, 3), max_tokens)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            
+            response = await self._complete(
+                model=self.model,
+                messages=[
+                    _SYSTEM_MESSAGES[mode],
+                    {"role": "user", "content": full_prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            
+            code, explanation = _split_response(response.choices[0].message.content)
+            if mode == "educational":
+                explanation = _enhance_explanation(explanation)
+            
+            result = {
                 "code": code,
                 "language": language,
                 "model": self.model,
-                "explanation": "Generated successfully"
+                "explanation": explanation or "Generated successfully"
             }
             
+            if cache_key is not None:
+                self._result_cache.put(cache_key, result)
+            
+            return result
+            
         except Exception as e:
             return {
                 "code": f"// Error generating code: {str(e)}",
                 "language": language,
-                "explanation": f"Failed to generate: {str(e)}"
+                "explanation": f"Failed to generate: {str(e)}",
+                "error": str(e)
             }
+    
+    async def generate_stream_async(self, prompt: str, language: str = "solidity", **options) -> AsyncIterator[str]:
+        """Stream the raw model response as text deltas while it is generated
+        
+        Unlike ``generate_async`` the output is not split into code and
+        explanation, is not cached, and errors are raised to the caller.
+        """
+        mode = options.get("mode")
+        if mode not in _SYSTEM_MESSAGES:
+            mode = "production"
+        
+        if self._limiter is not None:
+            await self._limiter.acquire()
+        
+        stream = await self._complete(
+            model=self.model,
+            messages=[
+                _SYSTEM_MESSAGES[mode],
+                {"role": "user", "content": f"Generate {language} code for: {prompt}"}
+            ],
+            temperature=options.get("temperature", 0.7),
+            max_tokens=options.get("max_tokens", 2000),
+            stream=True
+        )
+        
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+    
+    async def _run_tool(self, tool_name: str, params: Dict[str, Any]) -> MCPToolResult:
+        """Run a single MCP tool without blocking the event loop"""
+        tool = self.mcp_registry.get_tool(tool_name)
+        if not tool:
+            return MCPToolResult(success=False, data=None, error=f"Tool not found: {tool_name}")
+        return await tool.execute_async(params)
+    
+    async def generate_with_tools_async(
+        self,
+        prompt: str,
+        tools: List[str],
+        language: str = "solidity",
+        **options
+    ) -> Dict[str, Any]:
+        """Generate code with MCP tool output added to the prompt
+        
+        Tools run concurrently, so the tool phase costs the slowest tool
+        rather than the sum of all of them.
+        """
+        import asyncio
+        
+        params = _tool_params(prompt, language)
+        outcomes = await asyncio.gather(
+            *(self._run_tool(tool_name, params) for tool_name in tools),
+            return_exceptions=True
+        )
+        
+        tool_results = [
+            {"tool": tool_name, "result": outcome.data}
+            for tool_name, outcome in zip(tools, outcomes)
+            if isinstance(outcome, MCPToolResult) and outcome.success
+        ]
+        
+        result = await self.generate_async(_enhance_prompt_with_tools(prompt, tool_results), language, **options)
+        result["tools_used"] = [r["tool"] for r in tool_results]
+        return result
+    
+    async def generate_batch_async(
+        self,
+        prompts: List[Dict[str, Any]],
+        max_concurrent: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Generate code for many prompts concurrently, preserving input order
+        
+        Each entry is a dict of ``generate_async`` keyword arguments. At most
+        ``max_concurrent`` requests are in flight at once.
+        """
+        import asyncio
+        
+        semaphore = asyncio.Semaphore(max_concurrent or self.max_concurrent)
+        
+        async def run(prompt_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_async(**prompt_data)
+        
+        return await asyncio.gather(*(run(p) for p in prompts))
+
+
+# Per-process pool of sync transports, so repeated create_client calls (e.g. CLI
+# commands invoking each other) reuse one connection pool. API keys are stored
+# hashed in the keys.
+_SHARED_TRANSPORTS = _SharedTransports()
 
 
-def create_client(api_key: str, provider: str = "openai", model: str = None) -> CRAITEClient:
-    """Create a new CRAITE client instance"""
-    return CRAITEClient(api_key, provider, model)
+def create_client(
+    api_key: str,
+    provider: str = "openai",
+    model: str = None,
+    max_retries: int = 3,
+    timeout: float = 60.0
+) -> CRAITEClient:
+    """Create a CRAITE client, sharing the connection pool of identical settings
+    
+    Each call returns a new client, so its settings can be changed freely; only
+    the underlying HTTP transport is shared, and it is closed once every client
+    using it has been closed.
+    """
+    key = (provider, hashlib.sha256(api_key.encode()).hexdigest(), max_retries, timeout)
+    transport = _SHARED_TRANSPORTS.acquire(
+        key,
+        lambda: _build_sync_client(api_key, provider, max_retries, timeout)
+    )
+    return CRAITEClient(api_key, provider, model, max_retries, timeout, client=transport)
+
+
+def create_async_client(
+    api_key: str,
+    provider: str = "openai",
+    model: str = None,
+    max_concurrent: int = 5,
+    max_retries: int = 3,
+    timeout: float = 60.0,
+    rate_limit_qpm: Optional[int] = 500
+) -> AsyncCRAITEClient:
+    """Create a new async CRAITE client instance
+    
+    ``rate_limit_qpm`` caps request starts per minute (``None`` disables it).
+    Async clients are not cached: their connection pool is bound to the event
+    loop they were first used on.
+    """
+    return AsyncCRAITEClient(api_key, provider, model, max_concurrent, max_retries, timeout, rate_limit_qpm)
 
 
 # Re-export for backward compatibility
@@ -2,23 +2,56 @@
 MCP Tools implementation for CRAITE Python SDK
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Callable, ClassVar, Dict, Any, FrozenSet, Iterable, Iterator, List, MutableMapping, Optional, Set, Tuple
 import json
+import sys
 from dataclasses import dataclass
 
 
-@dataclass
+def _json_dumps(obj: Any) -> bytes:
+    # Compact UTF-8, matching orjson's output byte for byte on common data
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+try:
+    import orjson
+except ImportError:
+    _dumps = _json_dumps
+else:
+    def _dumps(obj: Any) -> bytes:
+        # Non-str keys are stringified, as the json module does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep __dict__
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class MCPToolResult:
     """Result from MCP tool execution"""
     success: bool
     data: Any
     error: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    
+    def to_json(self) -> bytes:
+        """Serialize the result to UTF-8 JSON (via orjson when installed)"""
+        return _dumps({
+            "success": self.success,
+            "data": self.data,
+            "error": self.error,
+            "metadata": self.metadata
+        })
 
 
 class BaseMCPTool(ABC):
     """Base class for MCP tools"""
     
+    __slots__ = ("name", "description")
+    
+    # Parameters execute() cannot fall back to a default for
+    REQUIRED: ClassVar[FrozenSet[str]] = frozenset()
+    
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
@@ -28,24 +61,52 @@ class BaseMCPTool(ABC):
         """Execute the tool with given parameters"""
         pass
     
-    def validate_params(self, params: Dict[str, Any], required: List[str]) -> bool:
-        """Validate required parameters"""
-        return all(param in params for param in required)
+    async def execute_async(self, params: Dict[str, Any]) -> MCPToolResult:
+        """Execute the tool without blocking the event loop
+        
+        Runs ``execute`` in the default executor; I/O-bound tools can override
+        this with a native coroutine.
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.execute, params)
+    
+    def validate_params(
+        self,
+        params: Dict[str, Any],
+        required: Optional[FrozenSet[str]] = None
+    ) -> Set[str]:
+        """Return the required parameters missing from ``params``
+        
+        Checks against the tool's ``REQUIRED`` set unless ``required`` is given.
+        """
+        if required is None:
+            required = self.REQUIRED
+        return required - params.keys()
+    
+    def _check_required(self, params: Dict[str, Any]) -> Optional[MCPToolResult]:
+        """Error result naming any ``REQUIRED`` parameters missing from ``params``"""
+        missing = self.validate_params(params)
+        if not missing:
+            return None
+        return MCPToolResult(
+            success=False,
+            data=None,
+            error=f"Missing required parameters: {', '.join(sorted(missing))}"
+        )
 
 
 class OpenZeppelinTool(BaseMCPTool):
     """OpenZeppelin contracts tool"""
     
-    def __init__(self):
-        super().__init__(
-            "openzeppelin_contracts",
-            "Access secure, audited smart contract templates from OpenZeppelin"
-        )
-        self.contracts = {
-            "ERC20": {
-                "base": "@openzeppelin/contracts/token/ERC20/ERC20.sol",
-                "features": ["Mintable", "Burnable", "Pausable", "Snapshot", "Permit"],
-                "template": """
+    __slots__ = ()
+    
+    contracts = {
+        "ERC20": {
+            "base": "@openzeppelin/contracts/token/ERC20/ERC20.sol",
+            "features": ["Mintable", "Burnable", "Pausable", "Snapshot", "Permit"],
+            "template": """
 pragma solidity ^0.8.0;
 
 import "{base}";
@@ -59,18 +120,40 @@ contract {name} is ERC20{features} {{
     {functions}
 }}
 """
-            },
-            "ERC721": {
-                "base": "@openzeppelin/contracts/token/ERC721/ERC721.sol",
-                "features": ["Enumerable", "URIStorage", "Burnable", "Pausable"],
-                "template": "// ERC721 template"
-            },
-            "ERC1155": {
-                "base": "@openzeppelin/contracts/token/ERC1155/ERC1155.sol",
-                "features": ["Supply", "Burnable", "Pausable"],
-                "template": "// ERC1155 template"
-            }
+        },
+        "ERC721": {
+            "base": "@openzeppelin/contracts/token/ERC721/ERC721.sol",
+            "features": ["Enumerable", "URIStorage", "Burnable", "Pausable"],
+            "template": "// ERC721 template"
+        },
+        "ERC1155": {
+            "base": "@openzeppelin/contracts/token/ERC1155/ERC1155.sol",
+            "features": ["Supply", "Burnable", "Pausable"],
+            "template": "// ERC1155 template"
         }
+    }
+    
+    # Import lines are fixed per contract type and feature, so build them once
+    _base_imports = {
+        contract_type: f'import "{info["base"]}";'
+        for contract_type, info in contracts.items()
+    }
+    _feature_imports = {
+        contract_type: {
+            feature: (
+                f'import "@openzeppelin/contracts/token/{contract_type}/'
+                f'extensions/{contract_type}{feature}.sol";'
+            )
+            for feature in info["features"]
+        }
+        for contract_type, info in contracts.items()
+    }
+    
+    def __init__(self):
+        super().__init__(
+            "openzeppelin_contracts",
+            "Access secure, audited smart contract templates from OpenZeppelin"
+        )
     
     def execute(self, params: Dict[str, Any]) -> MCPToolResult:
         """Generate OpenZeppelin contract template"""
@@ -88,15 +171,14 @@ contract {name} is ERC20{features} {{
         contract_info = self.contracts[contract_type]
         
         # Build imports
-        imports = [f'import "{contract_info["base"]}";']
+        imports = [self._base_imports[contract_type]]
+        feature_imports = self._feature_imports[contract_type]
         feature_names = []
         
         for feature in features:
-            if feature in contract_info["features"]:
-                imports.append(
-                    f'import "@openzeppelin/contracts/token/{contract_type}/'
-                    f'extensions/{contract_type}{feature}.sol";'
-                )
+            feature_import = feature_imports.get(feature)
+            if feature_import is not None:
+                imports.append(feature_import)
                 feature_names.append(feature)
         
         return MCPToolResult(
@@ -114,25 +196,51 @@ contract {name} is ERC20{features} {{
 class SolidityDocsTool(BaseMCPTool):
     """Solidity documentation tool"""
     
+    __slots__ = ()
+    
+    topics = {
+        "basics": {
+            "variables": "State variables, local variables, and global variables",
+            "functions": "Function modifiers, visibility, and state mutability",
+            "events": "Event declaration and emission",
+            "errors": "Custom errors and revert statements"
+        },
+        "advanced": {
+            "assembly": "Inline assembly and Yul",
+            "storage": "Storage layout and optimization",
+            "security": "Common vulnerabilities and mitigations",
+            "patterns": "Design patterns and best practices"
+        }
+    }
+    
+    examples = {
+        "basics": {
+            "variables": """
+uint256 public totalSupply;  // State variable
+function transfer(address to, uint256 amount) public {
+    uint256 balance = balances[msg.sender];  // Local variable
+    require(balance >= amount, "Insufficient balance");
+    // msg.sender is a global variable
+}
+""",
+            "functions": """
+modifier onlyOwner() {
+    require(msg.sender == owner, "Not the owner");
+    _;
+}
+
+function mint(address to, uint256 amount) public onlyOwner {
+    _mint(to, amount);
+}
+"""
+        }
+    }
+    
     def __init__(self):
         super().__init__(
             "solidity_docs",
             "Access Solidity language documentation and best practices"
         )
-        self.topics = {
-            "basics": {
-                "variables": "State variables, local variables, and global variables",
-                "functions": "Function modifiers, visibility, and state mutability",
-                "events": "Event declaration and emission",
-                "errors": "Custom errors and revert statements"
-            },
-            "advanced": {
-                "assembly": "Inline assembly and Yul",
-                "storage": "Storage layout and optimization",
-                "security": "Common vulnerabilities and mitigations",
-                "patterns": "Design patterns and best practices"
-            }
-        }
     
     def execute(self, params: Dict[str, Any]) -> MCPToolResult:
         """Retrieve Solidity documentation"""
@@ -161,61 +269,47 @@ class SolidityDocsTool(BaseMCPTool):
     
     def _get_examples(self, topic: str, subtopic: Optional[str]) -> Dict[str, str]:
         """Get code examples for topic"""
-        examples = {
-            "basics": {
-                "variables": """
-uint256 public totalSupply;  // State variable
-function transfer(address to, uint256 amount) public {
-    uint256 balance = balances[msg.sender];  // Local variable
-    require(balance >= amount, "Insufficient balance");
-    // msg.sender is a global variable
-}
-""",
-                "functions": """
-modifier onlyOwner() {
-    require(msg.sender == owner, "Not the owner");
-    _;
-}
-
-function mint(address to, uint256 amount) public onlyOwner {
-    _mint(to, amount);
-}
-"""
-            }
-        }
-        
-        return examples.get(topic, {}).get(subtopic, {})
+        return self.examples.get(topic, {}).get(subtopic, {})
 
 
 class SecurityAuditTool(BaseMCPTool):
     """Security audit tool"""
     
+    __slots__ = ()
+    
+    REQUIRED = frozenset({"code"})
+    
+    vulnerabilities = {
+        "reentrancy": {
+            "severity": "high",
+            "description": "External calls can re-enter the contract",
+            "mitigation": "Use checks-effects-interactions pattern or ReentrancyGuard"
+        },
+        "overflow": {
+            "severity": "medium",
+            "description": "Arithmetic operations can overflow",
+            "mitigation": "Use SafeMath or Solidity 0.8+ built-in checks"
+        },
+        "access_control": {
+            "severity": "high",
+            "description": "Missing or incorrect access control",
+            "mitigation": "Implement proper role-based access control"
+        }
+    }
+    
     def __init__(self):
         super().__init__(
             "security_audit",
             "Automated security checks and vulnerability detection"
         )
-        self.vulnerabilities = {
-            "reentrancy": {
-                "severity": "high",
-                "description": "External calls can re-enter the contract",
-                "mitigation": "Use checks-effects-interactions pattern or ReentrancyGuard"
-            },
-            "overflow": {
-                "severity": "medium",
-                "description": "Arithmetic operations can overflow",
-                "mitigation": "Use SafeMath or Solidity 0.8+ built-in checks"
-            },
-            "access_control": {
-                "severity": "high",
-                "description": "Missing or incorrect access control",
-                "mitigation": "Implement proper role-based access control"
-            }
-        }
     
     def execute(self, params: Dict[str, Any]) -> MCPToolResult:
         """Run security analysis"""
         
+        error = self._check_required(params)
+        if error is not None:
+            return error
+        
         code = params.get("code", "")
         language = params.get("language", "solidity")
         
@@ -263,32 +357,41 @@ class SecurityAuditTool(BaseMCPTool):
 class GasOptimizationTool(BaseMCPTool):
     """Gas optimization tool"""
     
+    __slots__ = ()
+    
+    REQUIRED = frozenset({"code"})
+    
+    optimizations = {
+        "storage": [
+            "Pack struct variables",
+            "Use bytes32 instead of string for fixed data",
+            "Cache storage variables in memory"
+        ],
+        "loops": [
+            "Cache array length outside loops",
+            "Use ++i instead of i++",
+            "Avoid unbounded loops"
+        ],
+        "functions": [
+            "Use external instead of public when possible",
+            "Use calldata instead of memory for read-only data",
+            "Short-circuit conditions"
+        ]
+    }
+    
     def __init__(self):
         super().__init__(
             "gas_optimization",
             "Analyze and optimize gas consumption"
         )
-        self.optimizations = {
-            "storage": [
-                "Pack struct variables",
-                "Use bytes32 instead of string for fixed data",
-                "Cache storage variables in memory"
-            ],
-            "loops": [
-                "Cache array length outside loops",
-                "Use ++i instead of i++",
-                "Avoid unbounded loops"
-            ],
-            "functions": [
-                "Use external instead of public when possible",
-                "Use calldata instead of memory for read-only data",
-                "Short-circuit conditions"
-            ]
-        }
     
     def execute(self, params: Dict[str, Any]) -> MCPToolResult:
         """Analyze gas usage and suggest optimizations"""
         
+        error = self._check_required(params)
+        if error is not None:
+            return error
+        
         code = params.get("code", "")
         
         suggestions = []
@@ -318,24 +421,71 @@ class GasOptimizationTool(BaseMCPTool):
         )
 
 
+class _ToolTable(MutableMapping):
+    """Name -> tool mapping that lists every default tool but builds it on access
+    
+    Bound ``execute`` methods are kept in step with every change, including
+    direct edits, so the registry can dispatch with a single dict lookup.
+    """
+    
+    __slots__ = ("_factories", "_tools", "dispatch")
+    
+    def __init__(self, factories: Dict[str, Callable[[], BaseMCPTool]]):
+        self._factories = dict(factories)
+        self._tools: Dict[str, BaseMCPTool] = {}
+        self.dispatch: Dict[str, Callable[[Dict[str, Any]], MCPToolResult]] = {}
+    
+    def __getitem__(self, name: str) -> BaseMCPTool:
+        tool = self._tools.get(name)
+        if tool is None:
+            tool = self._factories[name]()
+            self[name] = tool
+        return tool
+    
+    def __setitem__(self, name: str, tool: BaseMCPTool) -> None:
+        self._tools[name] = tool
+        self.dispatch[name] = tool.execute
+    
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self._tools.pop(name, None)
+        self.dispatch.pop(name, None)
+        self._factories.pop(name, None)
+    
+    def __contains__(self, name: object) -> bool:
+        # Checked without building the tool
+        return name in self._tools or name in self._factories
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict.fromkeys([*self._factories, *self._tools]))
+    
+    def __len__(self) -> int:
+        return len(self._factories.keys() | self._tools.keys())
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
 class MCPToolRegistry:
-    """Registry for MCP tools"""
+    """Registry for MCP tools
+    
+    ``tools`` lists every available tool; default tools are instantiated the
+    first time they are looked up rather than up front.
+    """
+    
+    _DEFAULT_FACTORIES = {
+        "openzeppelin_contracts": OpenZeppelinTool,
+        "solidity_docs": SolidityDocsTool,
+        "security_audit": SecurityAuditTool,
+        "gas_optimization": GasOptimizationTool
+    }
     
     def __init__(self):
-        self.tools: Dict[str, BaseMCPTool] = {}
-        self._register_default_tools()
-    
-    def _register_default_tools(self):
-        """Register default MCP tools"""
-        default_tools = [
-            OpenZeppelinTool(),
-            SolidityDocsTool(),
-            SecurityAuditTool(),
-            GasOptimizationTool()
-        ]
-        
-        for tool in default_tools:
-            self.register_tool(tool)
+        self.tools: MutableMapping[str, BaseMCPTool] = _ToolTable(self._DEFAULT_FACTORIES)
+        # Bound execute methods (kept in sync by the table), so execute_tool
+        # is a single dict lookup
+        self._dispatch = self.tools.dispatch
     
     def register_tool(self, tool: BaseMCPTool):
         """Register a new tool"""
@@ -347,7 +497,7 @@ class MCPToolRegistry:
     
     def list_tools(self) -> List[str]:
         """List all available tools"""
-        return list(self.tools.keys())
+        return list(self.tools)
     
     def enable_tool(self, name: str) -> bool:
         """Enable a tool (already registered by default)"""
@@ -355,12 +505,39 @@ class MCPToolRegistry:
     
     def execute_tool(self, name: str, params: Dict[str, Any]) -> MCPToolResult:
         """Execute a tool by name"""
-        tool = self.get_tool(name)
-        if not tool:
-            return MCPToolResult(
-                success=False,
-                data=None,
-                error=f"Tool not found: {name}"
-            )
+        execute = self._dispatch.get(name)
+        if execute is None:
+            # Not built yet: a default tool is created on first use
+            tool = self.get_tool(name)
+            if not tool:
+                return MCPToolResult(
+                    success=False,
+                    data=None,
+                    error=f"Tool not found: {name}"
+                )
+            execute = tool.execute
         
-        return tool.execute(params)
\ No newline at end of file
+        return execute(params)
+    
+    def execute_batch(
+        self,
+        requests: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> List[MCPToolResult]:
+        """Execute several (tool name, params) requests, returning results in order"""
+        execute_tool = self.execute_tool
+        return [execute_tool(name, params) for name, params in requests]
+
+
+_registry: Optional[MCPToolRegistry] = None
+
+
+def get_registry() -> MCPToolRegistry:
+    """Return the process-wide tool registry, creating it on first use
+    
+    Tools registered on the shared registry are visible to every client and
+    CLI command; construct ``MCPToolRegistry()`` directly for an isolated one.
+    """
+    global _registry
+    if _registry is None:
+        _registry = MCPToolRegistry()
+    return _registry
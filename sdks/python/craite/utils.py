@@ -3,23 +3,97 @@ Utility functions for CRAITE Python SDK
 """
 import re
 import os
-from typing import List, Dict, Any, Optional
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
 import hashlib
 import json
-from datetime import datetime
+import operator
+import time
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+
+# Patterns are compiled once at import instead of on every call
+_EVM_ADDR_BODY_RE = re.compile(r'[a-fA-F0-9]{40}')
+_SOL_ADDR_RE = re.compile(r'[1-9A-HJ-NP-Za-km-z]{32,44}')
+
+# Data locations may sit between a parameter's type and its name
+_DATA_LOCATIONS = frozenset({"memory", "storage", "calldata"})
+
+# Lookup tables shared by every call; read-only so callers can't alter them
+_CHAIN_IDS = MappingProxyType({
+    "ethereum": 1,
+    "goerli": 5,
+    "sepolia": 11155111,
+    "polygon": 137,
+    "mumbai": 80001,
+    "bsc": 56,
+    "bsc-testnet": 97,
+    "arbitrum": 42161,
+    "optimism": 10,
+    "avalanche": 43114
+})
+
+# Gas prices in Gwei (example values), as (speed, price) pairs
+_GAS_PRICES_GWEI = MappingProxyType({
+    "ethereum": (("slow", 20), ("standard", 30), ("fast", 40)),
+    "polygon": (("slow", 30), ("standard", 35), ("fast", 40)),
+    "bsc": (("slow", 3), ("standard", 5), ("fast", 7))
+})
+
+
+# JSON decoder, resolved on first use: importing orjson up front would cost
+# every CLI start, while only batch files need it
+_loads = None
+
+
+def json_loads(data):
+    """Decode JSON from str or bytes, using orjson when it is installed"""
+    global _loads
+    if _loads is None:
+        try:
+            import orjson
+            _loads = orjson.loads
+        except ImportError:
+            _loads = json.loads
+    return _loads(data)
+
+
+def _iter_code_blocks(content: str) -> Iterator[Tuple[int, int, str, str]]:
+    """Yield (start, end, language, code) for each fenced code block
+    
+    Matches exactly what ``re.finditer(r'```(\\w*)\\n([\\s\\S]*?)\\n```')``
+    would, but walks the fences with ``str.find``. The regex retries its lazy
+    body scan from every unclosed fence, which is quadratic on responses full
+    of them; here the first fence without a closer ends the search.
+    """
+    start = content.find("```")
+    while start >= 0:
+        # Language tag: the run of word characters (\w) after the fence
+        i = start + 3
+        size = len(content)
+        while i < size and (content[i].isalnum() or content[i] == "_"):
+            i += 1
+        
+        if i < size and content[i] == "\n":
+            close = content.find("\n```", i + 1)
+            if close < 0:
+                # Later fences open even further right, so none can close either
+                return
+            yield start, close + 4, content[start + 3:i], content[i + 1:close]
+            start = content.find("```", close + 4)
+        else:
+            start = content.find("```", start + 1)
 
 
 def extract_code_blocks(content: str) -> List[Dict[str, Any]]:
     """Extract code blocks from markdown content"""
-    pattern = r'```(\w*)\n([\s\S]*?)\n```'
-    matches = re.finditer(pattern, content)
-    
     blocks = []
-    for match in matches:
+    for start, end, language, code in _iter_code_blocks(content):
         blocks.append({
-            "language": match.group(1) or "plaintext",
-            "code": match.group(2),
-            "full_match": match.group(0)
+            "language": language or "plaintext",
+            "code": code,
+            "full_match": content[start:end]
         })
     
     return blocks
@@ -36,6 +110,35 @@ def validate_api_key(api_key: str) -> bool:
     return True
 
 
+# (epoch second, formatted local time) of the last timestamp produced; kept as
+# one tuple so threads never see a second paired with another second's text
+_last_timestamp = (-1, "")
+
+
+def _timestamp() -> str:
+    """Current local time as YYYYmmdd_HHMMSS, formatted at most once per second"""
+    global _last_timestamp
+    
+    now = int(time.time())
+    second, formatted = _last_timestamp
+    if now != second:
+        formatted = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+        _last_timestamp = (now, formatted)
+    return formatted
+
+
+def _timestamped_filename(filename: str) -> str:
+    """Insert the current timestamp before the file extension"""
+    base, ext = os.path.splitext(filename)
+    return f"{base}_{_timestamp()}{ext}"
+
+
+def _write_code(filepath: str, code: str) -> None:
+    # Encode once; write_bytes retries short writes. Binary mode keeps the
+    # model's "\n" line endings on every platform.
+    Path(filepath).write_bytes(code.encode("utf-8"))
+
+
 def save_code_to_file(
     code: str,
     filename: str,
@@ -49,61 +152,103 @@ def save_code_to_file(
     
     # Add timestamp if requested
     if add_timestamp:
-        base, ext = os.path.splitext(filename)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{base}_{timestamp}{ext}"
+        filename = _timestamped_filename(filename)
     
     filepath = os.path.join(directory, filename)
-    
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(code)
+    _write_code(filepath, code)
     
     return filepath
 
 
+def save_code_files(
+    files: Iterable[Tuple[str, str]],
+    directory: str = "generated",
+    add_timestamp: bool = True
+) -> List[str]:
+    """Save many (code, filename) pairs, creating the directory only once"""
+    
+    os.makedirs(directory, exist_ok=True)
+    
+    filepaths = []
+    for code, filename in files:
+        if add_timestamp:
+            filename = _timestamped_filename(filename)
+        
+        filepath = os.path.join(directory, filename)
+        _write_code(filepath, code)
+        filepaths.append(filepath)
+    
+    return filepaths
+
+
+# Indentation prefixes by nesting level, built once
+_INDENTS = tuple('    ' * i for i in range(64))
+
+
 def format_solidity_code(code: str) -> str:
     """Basic Solidity code formatting"""
     # Add proper indentation
-    lines = code.split('\n')
     formatted_lines = []
+    append = formatted_lines.append
     indent_level = 0
     
-    for line in lines:
+    for line in code.split('\n'):
         stripped = line.strip()
         
+        if not stripped:
+            append('')
+            continue
+        
         # Decrease indent for closing braces
-        if stripped.startswith('}'):
+        if stripped[0] == '}':
             indent_level = max(0, indent_level - 1)
         
         # Add indentation
-        if stripped:
-            formatted_lines.append('    ' * indent_level + stripped)
-        else:
-            formatted_lines.append('')
+        indent = _INDENTS[indent_level] if indent_level < len(_INDENTS) else '    ' * indent_level
+        append(indent + stripped)
         
         # Increase indent for opening braces
-        if stripped.endswith('{'):
+        if stripped[-1] == '{':
             indent_level += 1
     
     return '\n'.join(formatted_lines)
 
 
+# black module and its default Mode, loaded on first use; False once the
+# import has failed so a missing black isn't searched for on every call
+_black = None
+_black_mode = None
+
+
+def _load_black():
+    global _black, _black_mode
+    if _black is None:
+        try:
+            import black
+        except ImportError:
+            _black = False
+        else:
+            _black_mode = black.Mode()
+            _black = black
+    return _black
+
+
+@lru_cache(maxsize=256)
 def format_python_code(code: str) -> str:
-    """Format Python code using black if available"""
-    try:
-        import black
-        return black.format_str(code, mode=black.Mode())
-    except ImportError:
+    """Format Python code using black if available (memoized for repeated code)"""
+    black = _load_black()
+    if not black:
         # If black is not installed, return as-is
         return code
+    return black.format_str(code, mode=_black_mode)
 
 
-def estimate_gas_cost(code: str, network: str = "ethereum") -> Dict[str, Any]:
-    """Estimate gas cost for smart contract deployment"""
-    
+def _estimate_gas(code: str) -> int:
     # Simple estimation based on code size and complexity
     base_gas = 21000
-    code_size_gas = len(code.encode()) * 68  # Approximate gas per byte
+    # ASCII source has one byte per character, so skip the encode copy
+    code_size = len(code) if code.isascii() else len(code.encode())
+    code_size_gas = code_size * 68  # Approximate gas per byte
     
     # Count operations for complexity
     complexity_multiplier = 1.0
@@ -114,56 +259,148 @@ def estimate_gas_cost(code: str, network: str = "ethereum") -> Dict[str, Any]:
     if "mapping" in code:
         complexity_multiplier += 0.2
     
-    if "require(" in code or "assert(" in code:
-        complexity_multiplier += 0.1 * code.count("require(")
-    
-    estimated_gas = int((base_gas + code_size_gas) * complexity_multiplier)
-    
-    # Gas prices (example values)
-    gas_prices = {
-        "ethereum": {"slow": 20, "standard": 30, "fast": 40},  # Gwei
-        "polygon": {"slow": 30, "standard": 35, "fast": 40},
-        "bsc": {"slow": 3, "standard": 5, "fast": 7}
-    }
-    
-    network_prices = gas_prices.get(network, gas_prices["ethereum"])
+    # Only require() calls add weight, so a single count covers this check
+    require_count = code.count("require(")
+    if require_count:
+        complexity_multiplier += 0.1 * require_count
     
+    return int((base_gas + code_size_gas) * complexity_multiplier)
+
+
+def _gas_cost_result(estimated_gas: int, network_prices) -> Dict[str, Any]:
     return {
         "estimated_gas": estimated_gas,
-        "gas_prices_gwei": network_prices,
+        "gas_prices_gwei": dict(network_prices),
         "estimated_cost_eth": {
             speed: (estimated_gas * price) / 1e9
-            for speed, price in network_prices.items()
+            for speed, price in network_prices
         }
     }
 
 
+def estimate_gas_cost(code: str, network: str = "ethereum") -> Dict[str, Any]:
+    """Estimate gas cost for smart contract deployment"""
+    network_prices = _GAS_PRICES_GWEI.get(network, _GAS_PRICES_GWEI["ethereum"])
+    return _gas_cost_result(_estimate_gas(code), network_prices)
+
+
+def estimate_gas_cost_batch(
+    codes: Iterable[str],
+    network: str = "ethereum"
+) -> List[Dict[str, Any]]:
+    """Estimate gas cost for many contracts, resolving network prices once"""
+    network_prices = _GAS_PRICES_GWEI.get(network, _GAS_PRICES_GWEI["ethereum"])
+    return [_gas_cost_result(_estimate_gas(code), network_prices) for code in codes]
+
+
 def generate_contract_hash(code: str) -> str:
     """Generate a hash for contract code"""
-    return hashlib.sha256(code.encode()).hexdigest()
+    # hashlib's sha256 is OpenSSL's, which uses the CPU SHA extensions when present
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+# hashlib drops the GIL while hashing large buffers, but below about this much
+# input in total the thread pool costs more than it saves
+_PARALLEL_HASH_MIN_CHARS = 1 << 20
+
+
+def generate_contract_hashes(codes: List[str]) -> List[str]:
+    """Hash many contracts, spreading large batches over worker threads"""
+    if (
+        len(codes) > 1
+        and (os.cpu_count() or 1) > 1
+        and sum(map(len, codes)) >= _PARALLEL_HASH_MIN_CHARS
+    ):
+        # Imported here: concurrent.futures would add to every CLI start-up
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(generate_contract_hash, codes))
+    
+    return [generate_contract_hash(code) for code in codes]
+
+
+def _split_top_level(text: str, sep: str = ",") -> List[str]:
+    """Split on ``sep`` where it is not nested inside (), [] or {}"""
+    if "(" not in text and "[" not in text and "{" not in text:
+        return text.split(sep)
+    
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(text):
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    
+    return parts
+
+
+def _parse_parameter(param: str) -> Optional[Dict[str, str]]:
+    """Parse ``<type> [location] <name>``, returning None for unnamed parameters"""
+    tokens = param.split()
+    if len(tokens) < 2 or tokens[-1] in _DATA_LOCATIONS:
+        return None
+    
+    return {
+        "type": " ".join(token for token in tokens[:-1] if token not in _DATA_LOCATIONS),
+        "name": tokens[-1]
+    }
+
+
+def _find_constructor_params(code: str) -> Optional[str]:
+    """Return the text between a constructor's parentheses, if there is one"""
+    size = len(code)
+    start = code.find("constructor")
+    
+    while start >= 0:
+        i = start + 11  # len("constructor")
+        
+        # Skip identifiers that merely contain the word
+        if start == 0 or not (code[start - 1].isalnum() or code[start - 1] == "_"):
+            while i < size and code[i].isspace():
+                i += 1
+            
+            if i < size and code[i] == "(":
+                # Balanced-paren scan, letting str.find jump between parentheses
+                depth = 1
+                pos = i + 1
+                while depth:
+                    close = code.find(")", pos)
+                    if close < 0:
+                        return None
+                    nested = code.find("(", pos, close)
+                    if nested >= 0:
+                        depth += 1
+                        pos = nested + 1
+                    else:
+                        depth -= 1
+                        pos = close + 1
+                
+                return code[i + 1:pos - 1]
+        
+        start = code.find("constructor", i)
+    
+    return None
 
 
 def parse_constructor_args(code: str) -> List[Dict[str, str]]:
     """Parse constructor arguments from Solidity code"""
-    constructor_pattern = r'constructor\s*\((.*?)\)'
-    match = re.search(constructor_pattern, code, re.DOTALL)
+    params = _find_constructor_params(code)
     
-    if not match:
+    if not params:
         return []
     
-    args_str = match.group(1)
     args = []
-    
-    # Simple parsing - would need more robust parser for production
-    for arg in args_str.split(','):
-        arg = arg.strip()
-        if arg:
-            parts = arg.split()
-            if len(parts) >= 2:
-                args.append({
-                    "type": parts[0],
-                    "name": parts[-1]
-                })
+    for param in _split_top_level(params):
+        arg = _parse_parameter(param)
+        if arg is not None:
+            args.append(arg)
     
     return args
 
@@ -225,26 +462,27 @@ main()
 def validate_web3_address(address: str, network: str = "ethereum") -> bool:
     """Validate blockchain address format"""
     
-    if network in ["ethereum", "bsc", "polygon"]:
-        # EVM-compatible address
-        if not re.match(r'^0x[a-fA-F0-9]{40}$', address):
+    if network in ("ethereum", "bsc", "polygon"):
+        # EVM-compatible address: reject on length/prefix before the regex
+        if len(address) != 42 or not address.startswith("0x"):
             return False
-        return True
+        return _EVM_ADDR_BODY_RE.fullmatch(address, 2) is not None
     
     elif network == "solana":
         # Solana address (base58)
-        if not re.match(r'^[1-9A-HJ-NP-Za-km-z]{32,44}$', address):
+        if not 32 <= len(address) <= 44:
             return False
-        return True
+        return _SOL_ADDR_RE.fullmatch(address) is not None
     
     return False
 
 
+@lru_cache(maxsize=256)
 def create_test_template(
     contract_name: str,
     language: str = "javascript"
 ) -> str:
-    """Generate test template for smart contract"""
+    """Generate test template for smart contract (memoized per name/language)"""
     
     if language == "javascript":
         return f"""const {{ expect }} = require("chai");
@@ -310,23 +548,24 @@ def test_insufficient_balance(contract):
 # Blockchain-specific utilities
 def get_chain_id(network: str) -> int:
     """Get chain ID for network"""
-    chain_ids = {
-        "ethereum": 1,
-        "goerli": 5,
-        "sepolia": 11155111,
-        "polygon": 137,
-        "mumbai": 80001,
-        "bsc": 56,
-        "bsc-testnet": 97,
-        "arbitrum": 42161,
-        "optimism": 10,
-        "avalanche": 43114
-    }
-    
-    return chain_ids.get(network, 1)
+    return _CHAIN_IDS.get(network, 1)
+
+
+_WEI_PER_MICRO_ETHER = 10 ** 12
 
 
 def format_wei_to_ether(wei_value: int) -> str:
     """Convert Wei to Ether with proper formatting"""
-    ether = wei_value / 1e18
-    return f"{ether:.6f} ETH"
\ No newline at end of file
+    if isinstance(wei_value, float):
+        # e.g. amounts derived from estimate_gas_cost; sub-wei fractions are dropped
+        wei_value = int(wei_value)
+    else:
+        # Rejects str/Decimal with a TypeError rather than misformatting them
+        wei_value = operator.index(wei_value)
+    
+    # Integer arithmetic keeps large balances exact; rounds half up to 6 places
+    micro = (abs(wei_value) + _WEI_PER_MICRO_ETHER // 2) // _WEI_PER_MICRO_ETHER
+    # Splitting the zero-padded digits is cheaper than a divmod and two formats
+    digits = str(micro).rjust(7, "0")
+    sign = "-" if wei_value < 0 and micro else ""
+    return f"{sign}{digits[:-6]}.{digits[-6:]} ETH"
\ No newline at end of file
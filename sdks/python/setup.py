@@ -32,6 +32,13 @@ setup(
         "rich>=13.0.0",
         "openai>=1.0.0",
     ],
+    extras_require={
+        "fast": [
+            "orjson>=3.9.0",
+            "h2>=4.0.0",
+            "uvloop>=0.17.0; sys_platform != 'win32'",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "craite=craite.cli:main",
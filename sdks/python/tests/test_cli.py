@@ -0,0 +1,133 @@
+"""Tests for the CRAITE command-line interface"""
+
+import json
+from click.testing import CliRunner
+from craite import client as client_module
+from craite.cli import cli
+
+
+class FakeAsyncClient:
+    """Stands in for AsyncCRAITEClient without calling a model"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def generate_async(self, prompt, language="solidity", **options):
+        return {"code": f"// {prompt}", "language": language, "explanation": ""}
+
+    async def generate_stream_async(self, prompt, language="solidity", **options):
+        if prompt == "long":
+            for i in range(150):
+                yield f"{i},"
+            return
+        yield "```solidity\n"
+        if prompt == "fail":
+            raise RuntimeError("connection reset")
+        yield f"// {prompt}\n```"
+
+
+def run_batch(tmp_path, monkeypatch, lines, *args):
+    monkeypatch.setattr(client_module, "create_async_client", FakeAsyncClient)
+    prompts_file = tmp_path / "prompts.ndjson"
+    prompts_file.write_text("\n".join(lines) + "\n")
+    output_dir = tmp_path / "out"
+
+    result = CliRunner().invoke(
+        cli,
+        ["batch", str(prompts_file), "-o", str(output_dir), "--api-key", "test-key", *args]
+    )
+    return result, output_dir
+
+
+def test_batch_ndjson_reports_failed_prompts(tmp_path, monkeypatch):
+    """Test failing prompts are counted without stalling the worker queue"""
+    lines = [json.dumps({"prompt": "token"})]
+    # More failures than workers and queue slots: these used to kill every worker
+    lines += [json.dumps({"language": "solidity"})] * 30
+    lines += [json.dumps({"prompt": "nft", "filename": "missing/dir/nft.sol"})]
+    lines += [json.dumps({"prompt": "vault", "filename": "vault.sol"})]
+
+    result, output_dir = run_batch(tmp_path, monkeypatch, lines, "-c", "2")
+
+    assert result.exit_code == 1
+    assert "31 prompts failed" in result.output
+    assert (output_dir / "generated_0.solidity").read_text() == "// token"
+    assert (output_dir / "vault.sol").read_text() == "// vault"
+
+
+def test_batch_ndjson_decode_error_reports_line(tmp_path, monkeypatch):
+    """Test a malformed NDJSON line is reported with its line number"""
+    lines = [json.dumps({"prompt": "token"}), "", "{not json"]
+
+    result, _ = run_batch(tmp_path, monkeypatch, lines)
+
+    assert result.exit_code == 1
+    assert "Invalid prompts file: line 3:" in result.output
+
+
+def test_batch_stream_counts_interrupted_streams_as_failed(tmp_path, monkeypatch):
+    """Test a stream that errors midway is marked in its file and not counted as generated"""
+    lines = [
+        json.dumps({"prompt": "token", "filename": "token.sol"}),
+        json.dumps({"prompt": "fail", "filename": "fail.sol"}),
+    ]
+
+    result, output_dir = run_batch(tmp_path, monkeypatch, lines, "--stream")
+
+    assert result.exit_code == 1
+    assert "1 files saved" in result.output
+    assert "1 prompts failed" in result.output
+    assert (output_dir / "token.sol").read_text() == "// token"
+    assert (output_dir / "fail.sol").read_text().endswith("// Error generating code: connection reset")
+
+
+def test_batch_stream_writes_every_delta(tmp_path, monkeypatch):
+    """Test deltas written in batches add up to the full response"""
+    lines = [json.dumps({"prompt": "long", "filename": "long.txt"})]
+
+    result, output_dir = run_batch(tmp_path, monkeypatch, lines, "--stream")
+
+    assert result.exit_code == 0
+    assert (output_dir / "long.txt").read_text() == "".join(f"{i}," for i in range(150))
+
+
+def test_batch_rejects_non_positive_concurrency(tmp_path, monkeypatch):
+    """Test -c below 1 is a usage error instead of a run with no workers"""
+    for value in ("0", "-1"):
+        result, output_dir = run_batch(tmp_path, monkeypatch, [json.dumps({"prompt": "token"})], "-c", value)
+
+        assert result.exit_code == 2
+        assert "Invalid value for '-c' / '--max-concurrent'" in result.output
+        assert not output_dir.exists()
+
+
+def test_batch_counts_api_errors_as_failed(tmp_path, monkeypatch):
+    """Test an API error reported in the generate_async result fails the prompt"""
+    async def failing_complete(**kwargs):
+        raise RuntimeError("rate limited")
+
+    def create_failing_client(api_key, **kwargs):
+        client = client_module.AsyncCRAITEClient(api_key, **kwargs)
+        client._complete = failing_complete
+        return client
+
+    prompts_file = tmp_path / "prompts.ndjson"
+    prompts_file.write_text(json.dumps({"prompt": "token", "filename": "token.sol"}) + "\n")
+    output_dir = tmp_path / "out"
+    monkeypatch.setattr(client_module, "create_async_client", create_failing_client)
+
+    result = CliRunner().invoke(
+        cli,
+        ["batch", str(prompts_file), "-o", str(output_dir), "--api-key", "test-key"]
+    )
+
+    assert result.exit_code == 1
+    assert "0 files saved" in result.output
+    assert "1 prompts failed" in result.output
+    assert (output_dir / "token.sol").read_text() == "// Error generating code: rate limited"
@@ -1,7 +1,10 @@
 """Tests for CRAITE Python SDK"""
 
+import time
 import pytest
-from craite import create_client, CRAITEClient
+from types import SimpleNamespace
+from craite import create_client, create_async_client, CRAITEClient, AsyncCRAITEClient
+from craite.client import _AsyncRateLimiter, _get_headers, _split_response
 
 
 def test_create_client():
@@ -26,3 +29,142 @@ async def test_generate_mock():
     client = create_client("test-key")
     # Add mock test implementation
     pass
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_async_preserves_order(monkeypatch):
+    """Test batch generation returns results in prompt order"""
+    async def fake_generate(self, prompt, language="solidity", **options):
+        return {"code": prompt, "language": language}
+
+    monkeypatch.setattr(AsyncCRAITEClient, "generate_async", fake_generate)
+
+    async with create_async_client("test-key", max_concurrent=2) as client:
+        results = await client.generate_batch_async(
+            [{"prompt": f"prompt {i}"} for i in range(5)]
+        )
+
+    assert [r["code"] for r in results] == [f"prompt {i}" for i in range(5)]
+
+
+def test_generate_caches_deterministic_results():
+    """Test identical temperature=0 prompts only hit the API once"""
+    client = CRAITEClient("test-key")
+    calls = []
+
+    def fake_create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content="```solidity\ncontract A {}\n```")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client._complete = fake_create
+
+    first = client.generate("ERC20 token", temperature=0)
+    second = client.generate("ERC20 token", temperature=0)
+
+    assert first == second
+    assert first["code"] == "contract A {}"
+    assert len(calls) == 1
+
+
+def test_provider_auth_headers():
+    """Test each provider gets its own auth header scheme"""
+    assert _get_headers("openai", "test-key") == {}
+    assert _get_headers("anthropic", "test-key") == {
+        "x-api-key": "test-key",
+        "anthropic-version": "2023-06-01",
+    }
+
+    with pytest.raises(ValueError):
+        _get_headers("unknown", "test-key")
+
+
+def test_split_response_separates_code_and_explanation():
+    """Test code comes from the first block and prose from the rest"""
+    content = (
+        "Here is the token:\n"
+        "```solidity\ncontract A {}\n```\n"
+        "And a test:\n"
+        "```js\nit('works')\n```\n"
+        "Done."
+    )
+
+    code, explanation = _split_response(content)
+
+    assert code == "contract A {}"
+    assert explanation == "Here is the token:\n\nAnd a test:\n\nDone."
+    assert _split_response("plain code") == ("plain code", "")
+
+
+@pytest.mark.asyncio
+async def test_generate_with_tools_async_adds_tool_context(monkeypatch):
+    """Test tool output is added to the prompt and unknown tools are skipped"""
+    async def fake_generate(self, prompt, language="solidity", **options):
+        return {"code": prompt, "language": language}
+
+    monkeypatch.setattr(AsyncCRAITEClient, "generate_async", fake_generate)
+
+    async with create_async_client("test-key") as client:
+        result = await client.generate_with_tools_async(
+            "Create an ERC-721 collection",
+            tools=["openzeppelin_contracts", "missing_tool"]
+        )
+
+    assert result["tools_used"] == ["openzeppelin_contracts"]
+    assert "### Additional Context from MCP Tools:" in result["code"]
+    assert "ERC721" in result["code"]
+
+
+def test_create_client_shares_transport_not_client():
+    """Test identical settings share one connection pool but not client state"""
+    client = create_client("cache-test-key")
+    other = create_client("cache-test-key", model="gpt-4o")
+
+    assert other is not client
+    assert other.client is client.client
+
+    client.model = "gpt-3.5-turbo"
+    with create_client("cache-test-key") as fresh:
+        assert fresh.model == "gpt-4"
+
+    # The pool stays open until its last user closes; closing twice counts once
+    transport = client.client
+    client.close()
+    client.close()
+    assert not transport.is_closed()
+
+    other.close()
+    assert transport.is_closed()
+    with create_client("cache-test-key") as fresh:
+        assert fresh.client is not transport
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_beyond_burst():
+    """Test the token bucket delays requests once its burst is used up"""
+    limiter = _AsyncRateLimiter(2, period=0.2)
+
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire()
+
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_generate_stream_async_yields_deltas():
+    """Test streamed chunks are yielded as text deltas"""
+    async def fake_stream():
+        for text in ["contract ", None, "A {}"]:
+            delta = SimpleNamespace(content=text)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def fake_create(**kwargs):
+        assert kwargs["stream"] is True
+        return fake_stream()
+
+    async with create_async_client("test-key", rate_limit_qpm=None) as client:
+        client._complete = fake_create
+        deltas = [delta async for delta in client.generate_stream_async("ERC20 token")]
+
+    assert deltas == ["contract ", "A {}"]
@@ -0,0 +1,56 @@
+"""Tests for CRAITE MCP tools"""
+
+from craite.mcp_tools import MCPToolRegistry, MCPToolResult, SecurityAuditTool, _dumps, _json_dumps, get_registry
+
+
+def test_validate_params_reports_missing():
+    """Test missing required parameters are reported instead of analysed"""
+    tool = SecurityAuditTool()
+    assert tool.validate_params({}) == {"code"}
+    assert tool.validate_params({"code": ""}) == set()
+    assert tool.validate_params({}, frozenset({"code", "language"})) == {"code", "language"}
+    
+    result = get_registry().execute_tool("gas_optimization", {"prompt": "token"})
+    assert not result.success
+    assert result.error == "Missing required parameters: code"
+
+
+def test_execute_batch_preserves_order():
+    """Test batched tool execution returns one result per request, in order"""
+    code = "function f() { require(tx.origin == owner); }"
+    results = get_registry().execute_batch([
+        ("gas_optimization", {"code": code}),
+        ("missing_tool", {}),
+        ("security_audit", {"code": code}),
+    ])
+    
+    assert [result.success for result in results] == [True, False, True]
+    assert "suggestions" in results[0].data
+    assert results[1].error == "Tool not found: missing_tool"
+    assert results[2].data["issues"][0]["type"] == "access_control"
+
+
+def test_result_to_json_is_backend_independent():
+    """Test orjson and the stdlib fallback serialize results identically"""
+    result = MCPToolResult(True, {1: "x", "name": "Jetón"}, metadata={"tools": ["a", "b"]})
+    expected = '{"success":true,"data":{"1":"x","name":"Jetón"},"error":null,"metadata":{"tools":["a","b"]}}'
+    
+    assert result.to_json() == expected.encode("utf-8")
+    assert _json_dumps({1: "x", "é": [1.5, None]}) == _dumps({1: "x", "é": [1.5, None]})
+
+
+def test_registry_tools_lists_defaults_and_tracks_edits():
+    """Test tools lists every default up front and direct edits reach dispatch"""
+    registry = MCPToolRegistry()
+    assert list(registry.tools) == [
+        "openzeppelin_contracts", "solidity_docs", "security_audit", "gas_optimization"
+    ]
+    assert registry.tools["security_audit"].name == "security_audit"
+    
+    registry.execute_tool("solidity_docs", {})
+    del registry.tools["solidity_docs"]
+    assert "solidity_docs" not in registry.list_tools()
+    assert registry.execute_tool("solidity_docs", {}).error == "Tool not found: solidity_docs"
+    
+    registry.tools["audit"] = registry.tools["security_audit"]
+    assert registry.execute_tool("audit", {}).error == "Missing required parameters: code"
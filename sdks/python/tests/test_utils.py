@@ -0,0 +1,111 @@
+"""Tests for CRAITE utility helpers"""
+
+import re
+import pytest
+from craite.utils import (
+    estimate_gas_cost,
+    estimate_gas_cost_batch,
+    extract_code_blocks,
+    format_wei_to_ether,
+    generate_contract_hash,
+    generate_contract_hashes,
+    parse_constructor_args,
+    save_code_files,
+    validate_web3_address,
+)
+
+
+def test_validate_web3_address():
+    """Test EVM and Solana address validation"""
+    evm = "0x" + "aB" * 20
+    assert validate_web3_address(evm)
+    assert validate_web3_address(evm, "polygon")
+    assert not validate_web3_address(evm[:-1])
+    assert not validate_web3_address("0x" + "g" * 40)
+    assert not validate_web3_address("1x" + "a" * 40)
+    assert not validate_web3_address(evm + "\n")
+    
+    sol = "4Nd1mBQtrMJVYVfKf2PJy9NZUZdTAsp7D4xWLs4gDB4T"
+    assert validate_web3_address(sol, "solana")
+    assert not validate_web3_address(sol + "1", "solana")
+    assert not validate_web3_address("0" * 40, "solana")
+    
+    assert not validate_web3_address(evm, "unknown")
+
+
+def test_batch_helpers_match_single_calls():
+    """Test batch gas estimation and hashing agree with the per-contract helpers"""
+    codes = ["contract A {}", "mapping(address => uint) x; require(a); require(b);", "for (;;) {}"]
+    
+    assert estimate_gas_cost_batch(codes, "bsc") == [estimate_gas_cost(c, "bsc") for c in codes]
+    assert generate_contract_hashes(codes) == [generate_contract_hash(c) for c in codes]
+
+
+def test_parse_constructor_args():
+    """Test data locations, multi-word types and unnamed parameters"""
+    code = """
+    contract Token {
+        constructor(string memory name_, address payable owner, uint256[] calldata ids, uint8) {}
+    }
+    """
+    assert parse_constructor_args(code) == [
+        {"type": "string", "name": "name_"},
+        {"type": "address payable", "name": "owner"},
+        {"type": "uint256[]", "name": "ids"},
+    ]
+    assert parse_constructor_args("contract Empty {}") == []
+    
+    # Nested parentheses and identifiers that only contain the keyword
+    code = "_constructor(uint a);\nconstructor\n(function (uint256) external cb, uint x) {}"
+    assert parse_constructor_args(code) == [
+        {"type": "function (uint256) external", "name": "cb"},
+        {"type": "uint", "name": "x"},
+    ]
+    assert parse_constructor_args("constructor(uint a") == []
+
+
+def test_format_wei_to_ether():
+    """Test wei formatting is exact for large values and rounds to 6 places"""
+    assert format_wei_to_ether(0) == "0.000000 ETH"
+    assert format_wei_to_ether(1234567890123456789) == "1.234568 ETH"
+    assert format_wei_to_ether(10 ** 30 + 3 * 10 ** 12) == "1000000000000.000003 ETH"
+    assert format_wei_to_ether(-10 ** 12) == "-0.000001 ETH"
+    assert format_wei_to_ether(-1) == "0.000000 ETH"
+    assert format_wei_to_ether(1.5e18) == "1.500000 ETH"
+    assert format_wei_to_ether(-2.5e15) == "-0.002500 ETH"
+    
+    with pytest.raises(TypeError):
+        format_wei_to_ether("1000")
+
+
+def test_save_code_files(tmp_path):
+    """Test many files are saved into one directory, with optional timestamps"""
+    directory = tmp_path / "generated"
+    
+    paths = save_code_files([("contract A {}\n", "A.sol"), ("x = 'é'\n", "b.py")], str(directory), add_timestamp=False)
+    assert paths == [str(directory / "A.sol"), str(directory / "b.py")]
+    assert (directory / "b.py").read_bytes() == "x = 'é'\n".encode("utf-8")
+    
+    [path] = save_code_files([("// C", "C.sol")], str(directory))
+    assert path.startswith(str(directory / "C_")) and path.endswith(".sol")
+
+
+def test_extract_code_blocks_matches_regex():
+    """Test the fence walk finds exactly what the reference regex finds"""
+    pattern = re.compile(r'```(\w*)\n([\s\S]*?)\n```')
+    samples = [
+        "intro\n```solidity\ncontract A {}\n```\nmid\n```\nx = 1\n```",
+        "```ñ\nx\n```",
+        "```\n\n```",
+        "```\n```",
+        "````\ncode\n```",
+        "``` sol\nx\n```\n```py\ny\n```",
+        "```a\nb" * 50,
+        "```a\nunclosed then ```b\nclosed\n```",
+    ]
+    for content in samples:
+        expected = [
+            {"language": m.group(1) or "plaintext", "code": m.group(2), "full_match": m.group(0)}
+            for m in pattern.finditer(content)
+        ]
+        assert extract_code_blocks(content) == expected